@@ -6,6 +6,19 @@ from .reviewer import DocxReviewer
 from .utils import reviewed_path
 
 
+def positive_int(value: str) -> int:
+    """
+    Parses a command-line argument that must be a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
 def parse() -> argparse.Namespace:
     """
     Parses command-line arguments.
@@ -48,6 +61,30 @@ def parse() -> argparse.Namespace:
         default=".review_cache",
         help="Directory path where to store the cache (default: .review_cache)",
     )
+    parser.add_argument(
+        "--max-workers",
+        type=positive_int,
+        default=8,
+        help="Maximum number of concurrent requests to the LLM (default: 8)",
+    )
+    parser.add_argument(
+        "--min-chars",
+        type=int,
+        default=8,
+        help="Minimum number of characters of a paragraph to be reviewed (default: 8)",
+    )
+    parser.add_argument(
+        "--min-words",
+        type=int,
+        default=2,
+        help="Minimum number of words of a paragraph to be reviewed (default: 2)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=positive_int,
+        default=1,
+        help="Maximum number of paragraphs to review with a single prompt (default: 1)",
+    )
     parser.add_argument(
         "-v", "--verbose",
         action="store_true",
@@ -75,16 +112,23 @@ def app():
         cache_location=args.cache_location,
         api_key=args.api_key,
         base_url=args.base_url,
-        context=args.context
+        context=args.context,
+        max_workers=args.max_workers,
+        min_chars=args.min_chars,
+        min_words=args.min_words,
+        batch_size=args.batch_size,
     )
-    reviewer.review()
-    logger.info("Document review finished.")
+    try:
+        reviewer.review()
+        logger.info("Document review finished.")
 
-    # Save the reviewed document
-    output_path = reviewed_path(args.document_path)
-    logger.info(f"Saving reviewed document to: `{output_path}`")
-    reviewer.save(output_path)
-    logger.info("Document saved.")
+        # Save the reviewed document
+        output_path = reviewed_path(args.document_path)
+        logger.info(f"Saving reviewed document to: `{output_path}`")
+        reviewer.save(output_path)
+        logger.info("Document saved.")
+    finally:
+        reviewer.close()
 
 
 if __name__ == "__main__":
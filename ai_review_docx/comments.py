@@ -7,7 +7,8 @@ Code based on:
 """
 
 import datetime
-from xml.etree import ElementTree
+from xml.sax.saxutils import escape, quoteattr
+from lxml import etree
 from docx import document, oxml
 from docx.opc import constants as docx_constants
 from docx.opc import packuri, part
@@ -46,25 +47,143 @@ _COMMENTS_PART_DEFAULT_XML_BYTES = (
 ).strip()
 
 
-def add_formatted_comment(
-    docx_doc: document.Document,
+# Qualified names used when adding comments, computed once
+_QN_COMMENT = ns.qn("w:comment")
+_QN_ID = ns.qn("w:id")
+_QN_AUTHOR = ns.qn("w:author")
+_QN_DATE = ns.qn("w:date")
+_QN_RSID_DEL = ns.qn("w:rsidDel")
+_QN_RSID_R = ns.qn("w:rsidR")
+_QN_RSID_RPR = ns.qn("w:rsidRPr")
+_COMMENT_PARAGRAPH_START_TAG = f"<w:p {ns.nsdecls('w')}>"
+
+
+def ensure_comments_part(docx_doc: document.Document) -> part.Part:
+    """
+    Returns the comments part of a Word document, creating it if missing.
+
+    Args:
+        docx_doc: A Word document.
+    """
+    try:
+        return docx_doc.part.part_related_by(
+            docx_constants.RELATIONSHIP_TYPE.COMMENTS
+        )
+    except KeyError:
+        # No comments part found. As an XmlPart, its XML is serialized by
+        # python-docx when saving the document.
+        comments_part = part.XmlPart(
+            partname=packuri.PackURI("/word/comments.xml"),
+            content_type=docx_constants.CONTENT_TYPE.WML_COMMENTS,
+            element=oxml.parse_xml(_COMMENTS_PART_DEFAULT_XML_BYTES),
+            package=docx_doc.part.package,
+        )
+        docx_doc.part.relate_to(
+            comments_part, docx_constants.RELATIONSHIP_TYPE.COMMENTS
+        )
+        return comments_part
+
+
+class CommentsPart:
+    """
+    The comments part of a Word document, with its XML parsed only once.
+
+    New comments are appended to the parsed XML. For parts loaded by
+    python-docx as plain binary parts (python-docx < 1.2), the XML must be
+    written back to the part with `write` once all comments have been added.
+    """
+
+    def __init__(self, comments_part: part.Part):
+        """
+        Args:
+            comments_part: The comments part of a Word document.
+        """
+        self.part = comments_part
+        if isinstance(comments_part, part.XmlPart):
+            # Already parsed by python-docx, which serializes it when saving
+            self.xml = comments_part.element
+        else:
+            self.xml = oxml.parse_xml(comments_part.blob)
+        # Existing ids may not be contiguous (e.g., after deleting a comment in Word)
+        self._next_id = max(
+            (int(c.get(_QN_ID)) for c in self.xml.iterfind(_QN_COMMENT)), default=-1
+        ) + 1
+
+    @classmethod
+    def of(cls, docx_doc: document.Document) -> "CommentsPart":
+        """
+        Returns the comments part of a Word document, creating it if missing.
+
+        The parsed comments are kept on the part, so that they are parsed only
+        on first use.
+
+        Args:
+            docx_doc: A Word document.
+        """
+        comments_part = ensure_comments_part(docx_doc)
+        comments = getattr(comments_part, "_parsed_comments", None)
+        if comments is None:
+            comments = cls(comments_part)
+            comments_part._parsed_comments = comments
+        return comments
+
+    def new_comment_id(self) -> str:
+        """
+        Returns a new comment identifier, unique within the document.
+        """
+        comment_id = str(self._next_id)
+        self._next_id += 1
+        return comment_id
+
+    def append_comment(self, comment_element) -> None:
+        """
+        Appends a `w:comment` element to the comments.
+        """
+        self.xml.append(comment_element)
+
+    def serialize(self) -> bytes:
+        """
+        Serializes the XML of the comments.
+        """
+        return etree.tostring(
+            self.xml, xml_declaration=True, encoding="UTF-8", standalone=True
+        )
+
+    def write(self) -> None:
+        """
+        Writes the serialized XML of the comments back to the part.
+
+        Parts parsed by python-docx are serialized when saving, so this does
+        nothing for them.
+        """
+        if not isinstance(self.part, part.XmlPart):
+            self.part._blob = self.serialize()
+
+
+def append_formatted_comment(
+    comments: CommentsPart,
     location: tuple[paragraph.Paragraph | run.Run, paragraph.Paragraph | run.Run]
     | paragraph.Paragraph
     | run.Run,
     author: str,
     formatted_runs: list[tuple[str, dict]],
+    date: str | None = None,
 ) -> None:
     """
-    Adds a formatted comment to Word document with rich text support.
+    Appends a formatted comment to the comments part of a Word document.
+
+    The comments part is not reserialized, which allows adding many comments
+    and writing them only once with `CommentsPart.write`.
 
     Args:
-        docx_doc: A Word document.
+        comments: The comments part of the document.
         location: The paragraph and/or run object to place the comment on.
             May also be a tuple of these where the first element is the start
             and the second element is the end.
         author: Name of the comment author.
         formatted_runs: List of tuples (text, formatting_dict) where formatting_dict
             can contain 'color', 'strike', 'bold', etc.
+        date: ISO 8601 timestamp of the comment. Defaults to the current time.
     """
     if not isinstance(location, tuple):
         elements = (location._element, location._element)
@@ -73,75 +192,47 @@ def add_formatted_comment(
     else:
         elements = (location[0]._element, location[1]._element)
 
-    try:
-        comments_part = docx_doc.part.part_related_by(
-            docx_constants.RELATIONSHIP_TYPE.COMMENTS
-        )
-    except KeyError:
-        # No comments part found.
-        comments_part = part.Part(
-            partname=packuri.PackURI("/word/comments.xml"),
-            content_type=docx_constants.CONTENT_TYPE.WML_COMMENTS,
-            blob=_COMMENTS_PART_DEFAULT_XML_BYTES,
-            package=docx_doc.part.package,
-        )
-        docx_doc.part.relate_to(
-            comments_part, docx_constants.RELATIONSHIP_TYPE.COMMENTS
-        )
-
-    comments_xml = oxml.parse_xml(comments_part.blob)
-
     # Create the comment
-    comment_id = str(len(comments_xml.findall(ns.qn("w:comment"))))
+    comment_id = comments.new_comment_id()
     comment_element = oxml.OxmlElement("w:comment")
-    comment_element.set(ns.qn("w:id"), comment_id)
-    comment_element.set(ns.qn("w:author"), author)
-    comment_element.set(ns.qn("w:date"), datetime.datetime.now().isoformat())
-
-    # Create a paragraph with formatted runs
-    comment_paragraph = oxml.OxmlElement("w:p")
+    comment_element.set(_QN_ID, comment_id)
+    comment_element.set(_QN_AUTHOR, author)
+    if date is None:
+        date = datetime.datetime.now().isoformat()
+    comment_element.set(_QN_DATE, date)
 
+    # Create a paragraph with formatted runs, parsing it from a single XML string
+    xml_parts = [_COMMENT_PARAGRAPH_START_TAG]
     for text, formatting in formatted_runs:
         if not text:  # Skip empty text
             continue
 
-        comment_run = oxml.OxmlElement("w:r")
+        xml_parts.append("<w:r>")
 
         # Add formatting properties if any
         if formatting:
-            run_properties = oxml.OxmlElement("w:rPr")
-
+            xml_parts.append("<w:rPr>")
             if formatting.get("strike"):
-                strike_element = oxml.OxmlElement("w:strike")
-                run_properties.append(strike_element)
-
+                xml_parts.append("<w:strike/>")
             if formatting.get("color"):
-                color_element = oxml.OxmlElement("w:color")
-                color_element.set(ns.qn("w:val"), formatting["color"])
-                run_properties.append(color_element)
-
+                xml_parts.append(f"<w:color w:val={quoteattr(formatting['color'])}/>")
             if formatting.get("bold"):
-                bold_element = oxml.OxmlElement("w:b")
-                run_properties.append(bold_element)
-
-            comment_run.append(run_properties)
+                xml_parts.append("<w:b/>")
+            xml_parts.append("</w:rPr>")
 
         # Add the text
-        comment_text_element = oxml.OxmlElement("w:t")
-        comment_text_element.set(ns.qn("xml:space"), "preserve")
-        comment_text_element.text = text
-        comment_run.append(comment_text_element)
-        comment_paragraph.append(comment_run)
+        xml_parts.append(f'<w:t xml:space="preserve">{escape(text)}</w:t></w:r>')
+    xml_parts.append("</w:p>")
+    comment_paragraph = oxml.parse_xml("".join(xml_parts))
 
     comment_element.append(comment_paragraph)
-    comments_xml.append(comment_element)
-    comments_part._blob = ElementTree.tostring(comments_xml)
+    comments.append_comment(comment_element)
 
     # Create the commentRangeStart and commentRangeEnd elements
     comment_range_start = oxml.OxmlElement("w:commentRangeStart")
-    comment_range_start.set(ns.qn("w:id"), comment_id)
+    comment_range_start.set(_QN_ID, comment_id)
     comment_range_end = oxml.OxmlElement("w:commentRangeEnd")
-    comment_range_end.set(ns.qn("w:id"), comment_id)
+    comment_range_end.set(_QN_ID, comment_id)
 
     # Add the commentRangeStart to the first element and commentRangeEnd to the last element
     assert len(elements) == 2
@@ -150,16 +241,43 @@ def add_formatted_comment(
 
     # Add the comment reference
     comment_reference = oxml.OxmlElement("w:r")
-    comment_reference.set(ns.qn("w:rsidDel"), "00000000")
-    comment_reference.set(ns.qn("w:rsidR"), "00000000")
-    comment_reference.set(ns.qn("w:rsidRPr"), "00000000")
+    comment_reference.set(_QN_RSID_DEL, "00000000")
+    comment_reference.set(_QN_RSID_R, "00000000")
+    comment_reference.set(_QN_RSID_RPR, "00000000")
     comment_reference_element = oxml.OxmlElement("w:commentReference")
-    comment_reference_element.set(ns.qn("w:id"), comment_id)
+    comment_reference_element.set(_QN_ID, comment_id)
     comment_reference.append(comment_reference_element)
 
     elements[0].append(comment_reference)
 
 
+def add_formatted_comment(
+    docx_doc: document.Document,
+    location: tuple[paragraph.Paragraph | run.Run, paragraph.Paragraph | run.Run]
+    | paragraph.Paragraph
+    | run.Run,
+    author: str,
+    formatted_runs: list[tuple[str, dict]],
+    date: str | None = None,
+) -> None:
+    """
+    Adds a formatted comment to Word document with rich text support.
+
+    Args:
+        docx_doc: A Word document.
+        location: The paragraph and/or run object to place the comment on.
+            May also be a tuple of these where the first element is the start
+            and the second element is the end.
+        author: Name of the comment author.
+        formatted_runs: List of tuples (text, formatting_dict) where formatting_dict
+            can contain 'color', 'strike', 'bold', etc.
+        date: ISO 8601 timestamp of the comment. Defaults to the current time.
+    """
+    comments = CommentsPart.of(docx_doc)
+    append_formatted_comment(comments, location, author, formatted_runs, date)
+    comments.write()
+
+
 def add_comment(
     docx_doc: document.Document,
     location: tuple[paragraph.Paragraph | run.Run, paragraph.Paragraph | run.Run]
@@ -1,10 +1,14 @@
+import concurrent.futures
+import datetime
+import hashlib
+import json
 from typing import Iterator, Optional
 from loguru import logger
 import docx
 from diskcache import Cache
 import litellm
-from .comments import add_formatted_comment
-from .utils import preview, colored_console_diff, formatted_diff_for_docx
+from .comments import CommentsPart, append_formatted_comment
+from .utils import normalize_text, preview, compute_diff, colored_console_diff, formatted_diff_for_docx
 
 
 class DocxReviewer:
@@ -13,7 +17,8 @@ class DocxReviewer:
     """
 
     def __init__(self, document_path: str, model_name: str, cache_location: str, api_key: Optional[str] = None,
-                 base_url: Optional[str] = None, context: Optional[str] = None):
+                 base_url: Optional[str] = None, context: Optional[str] = None, max_workers: int = 8,
+                 min_chars: int = 8, min_words: int = 2, batch_size: int = 1):
         """
         Initialize the DocxReviewer.
 
@@ -24,6 +29,10 @@ class DocxReviewer:
             api_key: The API key for the LLM provider.
             base_url: The base URL for the LLM provider API.
             context: Optional context to add to the review prompt.
+            max_workers: Maximum number of concurrent requests to the LLM.
+            min_chars: Minimum number of characters of a paragraph to be reviewed.
+            min_words: Minimum number of words of a paragraph to be reviewed.
+            batch_size: Maximum number of paragraphs to review with a single prompt.
         """
         logger.info(f"Initializing DocxReviewer on document '{document_path}' using model '{model_name}'")
         self.model_name = model_name
@@ -32,6 +41,37 @@ class DocxReviewer:
         self.cache = Cache(cache_location)
         self.api_key = api_key
         self.base_url = base_url
+        self.max_workers = max_workers
+        self.min_chars = min_chars
+        self.min_words = min_words
+        self.batch_size = batch_size
+        # In-process memoization of the responses, to skip repeated paragraphs within a run
+        self._memo: dict[bytes, str] = {}
+        # The comments part is parsed on first use and written only once, when saving
+        self._comments: Optional[CommentsPart] = None
+        # All the comments of a review share the same timestamp
+        self._review_timestamp = datetime.datetime.now().isoformat()
+
+    def cached_response(self, prompt: str) -> Optional[str]:
+        """
+        Returns the cached response to a prompt, or None if the prompt was never sent to the LLM.
+        """
+        cache_key = self._cache_key(prompt)
+        if cache_key in self._memo:
+            return self._memo[cache_key]
+
+        response = self.cache.get(cache_key)
+        if response is not None:
+            self._memo[cache_key] = response
+        return response
+
+    def store_response(self, prompt: str, response: str):
+        """
+        Stores the response to a prompt in the cache.
+        """
+        cache_key = self._cache_key(prompt)
+        self.cache[cache_key] = response
+        self._memo[cache_key] = response
 
     def ask_llm(self, prompt: str) -> str:
         """
@@ -40,100 +80,227 @@ class DocxReviewer:
         :param prompt: The prompt to send to the language model.
         :return: The response from the language model.
         """
-        cache_key = (self.model_name, prompt)
-
-        with self.cache as cache:
-            if cache_key in cache:
-                return cache[cache_key]
-            else:
-                response = litellm.completion(
-                    model=self.model_name,
-                    messages=[{"role": "user", "content": prompt}],
-                    api_key=self.api_key,
-                    base_url=self.base_url,
-                )
-                response = response.choices[0].message.content.strip()
-                cache[cache_key] = response
-                return response
+        response = self.cached_response(prompt)
+        if response is None:
+            response = self._completion(prompt)
+            self.store_response(prompt, response)
+        return response
+
+    def _cache_key(self, prompt: str) -> bytes:
+        return hashlib.blake2b(f"{self.model_name}\0{prompt}".encode(), digest_size=16).digest()
+
+    def _completion(self, prompt: str) -> str:
+        response = litellm.completion(
+            model=self.model_name,
+            messages=[{"role": "user", "content": prompt}],
+            api_key=self.api_key,
+            base_url=self.base_url,
+        )
+        return response.choices[0].message.content.strip()
+
+    def comments(self) -> CommentsPart:
+        """
+        Returns the comments part of the document, creating it if missing.
+        """
+        if self._comments is None:
+            self._comments = CommentsPart.of(self.document)
+        return self._comments
 
     def report_paragraph_changes(self, paragraph_id: str, paragraph: docx.text.paragraph.Paragraph,
-                                 corrected_text: Optional[str]):
+                                 corrected_text: Optional[str], original_text: str):
         """
         Reports the changes made to a paragraph, adding a comment to the document.
+
+        Args:
+            paragraph_id: An identifier of the reviewed paragraph.
+            paragraph: The reviewed paragraph.
+            corrected_text: The text suggested by the LLM, if any.
+            original_text: The normalized text of the paragraph, as sent to the LLM.
         """
         if corrected_text is None:
             logger.debug(f"Review of {paragraph_id}: No changes proposed by LLM.")
             return
 
-        original_text = paragraph.text.strip()
-        if original_text == corrected_text:
+        # Suggestions that only differ in whitespace are not worth a diff
+        if original_text == corrected_text or original_text == normalize_text(corrected_text):
             logger.debug(f"Review of {paragraph_id}: No changes proposed by LLM.")
             return
 
+        diffs = compute_diff(original_text, corrected_text)
         logger.warning(f"Review of {paragraph_id}: Change proposed.")
         logger.warning(f"  Original:  '{original_text}'")
         logger.warning(f"  Suggested: '{corrected_text}'")
-        logger.warning(f"  Diff:      '{colored_console_diff(original_text, corrected_text)}'")
+        logger.opt(lazy=True).warning(
+            "  Diff:      '{}'", lambda: colored_console_diff(original_text, corrected_text, diffs)
+        )
 
         # Add the colored diff to the docx comment
-        formatted_runs = formatted_diff_for_docx(original_text, corrected_text)
-        add_formatted_comment(self.document, paragraph, "Reviewer", formatted_runs)
+        formatted_runs = formatted_diff_for_docx(original_text, corrected_text, diffs)
+        append_formatted_comment(self.comments(), paragraph, "Reviewer", formatted_runs, self._review_timestamp)
+
+
+    def should_review(self, text: str) -> bool:
+        """
+        Checks whether a text is worth reviewing with the LLM.
+
+        Short texts, single words and texts without letters (e.g., headings, page numbers, dates)
+        carry no useful grammar signal, so they are not sent to the LLM.
+        """
+        return (
+            len(text) >= self.min_chars
+            and len(text.split()) >= self.min_words
+            and any(c.isalpha() for c in text)
+        )
 
+    def review_prompt(self, text: str) -> str:
+        """
+        Returns the prompt to review a single text.
+        """
+        prompt = (
+            "Review the following text for obvious grammatical errors and spelling mistakes. "
+            "If you find mistakes, return ONLY the corrected text. "
+            "If the text is already correct, return ONLY the original text unchanged."
+        )
+        if self.context:
+            prompt += f"\n\n{self.context}"
+        prompt += f"\n\nText:\n\n{text}"
+        return prompt
+
+    def is_cached(self, text: str) -> bool:
+        """
+        Checks whether the review of a text is already cached.
+        """
+        return self.cached_response(self.review_prompt(text)) is not None
 
-    def review_paragraph(self, paragraph_id: str, paragraph: docx.text.paragraph.Paragraph):
+    def review_text(self, text: str) -> str:
         """
         Reviews text using LLM, returning the corrected text.
 
+        This does not modify the document, so it can be called from worker threads.
+
         Args:
-            paragraph_id: An identifier of the paragraph to be reviewed.
-            paragraph: The paragraph to be reviewed.
+            text: The text to be reviewed.
         """
-        paragraph_text = paragraph.text.strip()
-        logger.info(f"Reviewing {paragraph_id}: '{preview(paragraph_text)}'")
+        if not self.should_review(text):
+            return text
+
+        return self.ask_llm(self.review_prompt(text))
+
+    def review_texts(self, texts: list[str]) -> list[str]:
+        """
+        Reviews multiple texts using a single LLM prompt, returning the corrected texts in the same order.
+
+        Each corrected text is cached as if it was reviewed on its own. If the response of the LLM
+        cannot be parsed, the texts are reviewed one by one.
+        This does not modify the document, so it can be called from worker threads.
+
+        Args:
+            texts: The texts to be reviewed.
+        """
+        if len(texts) == 1:
+            return [self.review_text(texts[0])]
+
+        prompt = (
+            "Review each of the following texts for obvious grammatical errors and spelling mistakes. "
+            "If you find mistakes in a text, correct it. "
+            "If a text is already correct, keep it unchanged. "
+            "Return ONLY a JSON array of strings with the reviewed texts, in the same order as the given ones."
+        )
+        if self.context:
+            prompt += f"\n\n{self.context}"
+        prompt += f"\n\nTexts:\n\n{json.dumps(texts, ensure_ascii=False)}"
+        response = self._completion(prompt)
 
         try:
-            if paragraph_text:
-                prompt = (
-                    "Review the following text for obvious grammatical errors and spelling mistakes. "
-                    "If you find mistakes, return ONLY the corrected text. "
-                    "If the text is already correct, return ONLY the original text unchanged."
-                )
-                if self.context:
-                    prompt += f"\n\n{self.context}"
-                prompt += f"\n\nText:\n\n{paragraph_text}"
-                corrected_text = self.ask_llm(prompt)
-            else:
-                corrected_text = paragraph_text
-            self.report_paragraph_changes(paragraph_id, paragraph, corrected_text)
-        except Exception as e:
-            logger.error(f"Unexpected error during LLM review: {e}", exc_info=True)
-
-    def review_table(self, table_id: str, table: docx.table.Table):
-        """
-        Reviews a table using LLM, returning (True, corrected_text) if changed, else (False, None).
-        """
-        logger.info(f"Reviewing table {table_id}.")
-
-        for cell_index, cell in enumerate(table_itercells(table)):
-            for paragraph_index, paragraph in enumerate(cell.paragraphs):
-                paragraph_id = f"table {table_id}, cell {cell_index}, paragraph {paragraph_index}/{len(cell.paragraphs)}"
-                self.review_paragraph(paragraph_id, paragraph)
+            # Ignore any text around the array, such as Markdown code fences
+            corrected_texts = json.loads(response[response.find("["):response.rfind("]") + 1])
+            if not isinstance(corrected_texts, list) or len(corrected_texts) != len(texts) \
+                    or not all(isinstance(corrected_text, str) for corrected_text in corrected_texts):
+                raise ValueError("expected an array of strings with one entry per text")
+        except ValueError as e:
+            logger.warning(f"Invalid response to a batch of {len(texts)} texts ({e}). Reviewing them one by one.")
+            return [self.review_text(text) for text in texts]
 
-    def review(self):
+        corrected_texts = [corrected_text.strip() for corrected_text in corrected_texts]
+        for text, corrected_text in zip(texts, corrected_texts):
+            self.store_response(self.review_prompt(text), corrected_text)
+        return corrected_texts
+
+    def _iter_reviewable(self) -> Iterator[tuple[str, docx.text.paragraph.Paragraph]]:
         """
-        Reviews the document for grammatical and spelling errors.
+        Iterates over the paragraphs to be reviewed, together with their identifiers.
+
+        The paragraphs of the document body come first, followed by the paragraphs in the cells of the tables.
         """
-        total_paragraphs = len(self.document.paragraphs)
+        document_paragraphs = self.document.paragraphs
+        total_paragraphs = len(document_paragraphs)
         logger.info(f"Processing {total_paragraphs} paragraphs.")
 
-        for i, paragraph in enumerate(self.document.paragraphs):
-            self.review_paragraph(f"paragraph {i}/{total_paragraphs}", paragraph)
+        for i, paragraph in enumerate(document_paragraphs):
+            yield f"paragraph {i}/{total_paragraphs}", paragraph
 
-        total_tables = len(self.document.tables)
+        tables = self.document.tables
+        total_tables = len(tables)
         logger.info(f"Processing {total_tables} tables.")
 
-        for i, table in enumerate(self.document.tables):
-            self.review_table(f"{i}/{total_tables}", table)
+        for table_index, table in enumerate(tables):
+            for cell_index, cell in enumerate(table_itercells(table)):
+                cell_paragraphs = cell.paragraphs
+                total_cell_paragraphs = len(cell_paragraphs)
+                for paragraph_index, paragraph in enumerate(cell_paragraphs):
+                    yield (f"table {table_index}/{total_tables}, cell {cell_index}, "
+                           f"paragraph {paragraph_index}/{total_cell_paragraphs}"), paragraph
+
+    def review(self):
+        """
+        Reviews the document for grammatical and spelling errors.
+
+        The LLM is queried concurrently, while the document is only modified from the calling thread.
+        """
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            try:
+                reviews = []
+                jobs = {}
+                batch = []
+                for paragraph_id, paragraph in self._iter_reviewable():
+                    paragraph_text = normalize_text(paragraph.text)
+                    logger.opt(lazy=True).info(
+                        "Reviewing {}: '{}'", lambda: paragraph_id, lambda: preview(paragraph_text)
+                    )
+                    reviews.append((paragraph_id, paragraph, paragraph_text))
+
+                    # Identical paragraphs (e.g., headers or boilerplate) share a single request
+                    if paragraph_text in jobs or paragraph_text in batch:
+                        continue
+
+                    # Uncached paragraphs are grouped in batches, reviewed with a single prompt
+                    if self.batch_size > 1 and self.should_review(paragraph_text) and not self.is_cached(paragraph_text):
+                        batch.append(paragraph_text)
+                        if len(batch) == self.batch_size:
+                            self._submit_review(executor, jobs, batch)
+                            batch = []
+                    else:
+                        self._submit_review(executor, jobs, [paragraph_text])
+                if batch:
+                    self._submit_review(executor, jobs, batch)
+
+                # Report the results in document order
+                for paragraph_id, paragraph, paragraph_text in reviews:
+                    future, index = jobs[paragraph_text]
+                    try:
+                        self.report_paragraph_changes(paragraph_id, paragraph, future.result()[index], paragraph_text)
+                    except Exception as e:
+                        logger.error(f"Unexpected error during LLM review of {paragraph_id}: {e}", exc_info=True)
+            except BaseException:
+                # Do not wait for the queued requests on errors or interruptions (e.g., Ctrl-C)
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+
+    def _submit_review(self, executor: concurrent.futures.Executor,
+                       jobs: dict[str, tuple[concurrent.futures.Future, int]], texts: list[str]):
+        future = executor.submit(self.review_texts, texts)
+        for index, text in enumerate(texts):
+            jobs[text] = (future, index)
 
     def save(self, output_path: str):
         """
@@ -142,19 +309,29 @@ class DocxReviewer:
         Args:
             output_path: Path to the output DOCX file.
         """
+        if self._comments is not None:
+            self._comments.write()
         self.document.save(output_path)
 
+    def close(self):
+        """
+        Closes the cache of model responses.
+        """
+        self.cache.close()
+
 
 def table_itercells(table: docx.table.Table) -> Iterator[docx.table._Cell]:
     """
     Iterate over the cells of a table, without revisiting cells merged vertically or horizontally.
 
-    Source: https://stackoverflow.com/a/78935428/2491528
+    Based on: https://stackoverflow.com/a/78935428/2491528
     """
-    for r, row in enumerate(table.rows):
-        for c, cell in enumerate(row.cells):
-            # check if the cell equals the previous cell either horizontally or vertically
-            if (r > 0 and c < len(table.rows[r - 1].cells) and cell._tc is table.rows[r - 1].cells[c]._tc) \
-                or (c > 0 and cell._tc is row.cells[c - 1]._tc):
+    # Merged cells share the same `w:tc` element. The elements themselves are kept in the set, because lxml
+    # returns the same proxy object for an element only while a reference to it is alive.
+    seen = set()
+    for row in table.rows:
+        for cell in row.cells:
+            if cell._tc in seen:
                 continue
+            seen.add(cell._tc)
             yield cell
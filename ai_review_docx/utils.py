@@ -1,3 +1,5 @@
+from pathlib import Path
+from typing import Optional
 from diff_match_patch import diff_match_patch
 
 # ANSI color codes
@@ -5,67 +7,87 @@ ANSI_RED = "\033[91m"
 ANSI_GREEN = "\033[92m"
 ANSI_RESET = "\033[0m"
 
+# Maximum number of characters shown by `preview`
+PREVIEW_LEN = 50
+
+_DMP = diff_match_patch()
+
+# Console format of each diff operation
+_CONSOLE_DIFF_FORMATS = {
+    _DMP.DIFF_DELETE: ANSI_RED + "{}" + ANSI_RESET,
+    _DMP.DIFF_INSERT: ANSI_GREEN + "{}" + ANSI_RESET,
+    _DMP.DIFF_EQUAL: "{}",
+}
+
+# Word formatting of each diff operation, shared by all the runs (do not modify)
+_FMT_DEL = {"color": "FF0000", "strike": True}  # Red color with strikethrough for deletions
+_FMT_INS = {"color": "00B050"}  # Green color for insertions
+_FMT_EQUAL = {}  # No formatting for unchanged text
+_DOCX_DIFF_FORMATS = {
+    _DMP.DIFF_DELETE: _FMT_DEL,
+    _DMP.DIFF_INSERT: _FMT_INS,
+    _DMP.DIFF_EQUAL: _FMT_EQUAL,
+}
+
 
 def reviewed_path(original_path: str) -> str:
     """
     Generates the file path for the reviewed document.
     """
-    return original_path.replace(".docx", "_reviewed.docx")
+    path = Path(original_path)
+    return str(path.with_name(path.stem + "_reviewed" + path.suffix))
+
+
+def normalize_text(text: str) -> str:
+    """
+    Strips the text and collapses any internal whitespace into single spaces.
+    """
+    return " ".join(text.split())
 
 
-def colored_console_diff(text1: str, text2: str) -> str:
+def compute_diff(text1: str, text2: str) -> list[tuple[int, str]]:
+    """
+    Computes a semantically cleaned-up diff between two texts.
+    """
+    diffs = _DMP.diff_main(text1, text2)
+    _DMP.diff_cleanupSemantic(diffs)
+    return diffs
+
+
+def colored_console_diff(text1: str, text2: str, diffs: Optional[list[tuple[int, str]]] = None) -> str:
     """
     Computes a diff and formats it with console color tags.
+
+    A diff already computed with `compute_diff` can be passed to avoid computing it again.
     """
-    dmp = diff_match_patch()
-    diffs = dmp.diff_main(text1, text2)
-    dmp.diff_cleanupSemantic(diffs)
-    
-    colored_parts = []
-    for (op, data) in diffs:
-        if op == dmp.DIFF_DELETE:
-            colored_parts.append(f"{ANSI_RED}{data}{ANSI_RESET}")
-        elif op == dmp.DIFF_INSERT:
-            colored_parts.append(f"{ANSI_GREEN}{data}{ANSI_RESET}")
-        elif op == dmp.DIFF_EQUAL:
-            colored_parts.append(data)
-    return "".join(colored_parts)
+    if diffs is None:
+        diffs = compute_diff(text1, text2)
+
+    return "".join(_CONSOLE_DIFF_FORMATS[op].format(data) for op, data in diffs)
 
 
 def preview(text: str) -> str:
     """
-    Returns a preview of the text.
+    Returns a preview of the text, truncated to `PREVIEW_LEN` characters.
     """
-    if len(text) > 50:
-        return text[:50] + "..."
-    else:
-        return text
+    return text if len(text) <= PREVIEW_LEN else text[:PREVIEW_LEN] + "..."
 
 
-def formatted_diff_for_docx(text1: str, text2: str) -> list[tuple[str, dict]]:
+def formatted_diff_for_docx(text1: str, text2: str,
+                            diffs: Optional[list[tuple[int, str]]] = None) -> list[tuple[str, dict]]:
     """
     Computes a diff and returns formatted runs for Word documents.
 
+    A diff already computed with `compute_diff` can be passed to avoid computing it again.
+
     Returns:
         List of tuples (text, formatting_dict) where:
         - Deletions are formatted with red color and strikethrough
         - Insertions are formatted with green color
         - Unchanged text has no formatting
+        The formatting dicts are shared between calls and must not be modified.
     """
-    dmp = diff_match_patch()
-    diffs = dmp.diff_main(text1, text2)
-    dmp.diff_cleanupSemantic(diffs)
-
-    formatted_runs = []
-    for (op, data) in diffs:
-        if op == dmp.DIFF_DELETE:
-            # Red color with strikethrough for deletions
-            formatted_runs.append((data, {"color": "FF0000", "strike": True}))
-        elif op == dmp.DIFF_INSERT:
-            # Green color for insertions
-            formatted_runs.append((data, {"color": "00B050"}))
-        elif op == dmp.DIFF_EQUAL:
-            # No formatting for unchanged text
-            formatted_runs.append((data, {}))
-
-    return formatted_runs
+    if diffs is None:
+        diffs = compute_diff(text1, text2)
+
+    return [(data, _DOCX_DIFF_FORMATS[op]) for op, data in diffs]